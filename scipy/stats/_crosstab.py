@@ -188,7 +188,10 @@ def crosstab(*args, levels=None, sparse=False):
         count.sum_duplicates()
     else:
         shape = [len(u) for u in actual_levels]
-        count = np.zeros(shape, dtype=int)
-        np.add.at(count, indices, 1)
+        # Count the flat indices with bincount, which is much faster than
+        # the unbuffered np.add.at.
+        flat = np.ravel_multi_index(indices, shape)
+        count = np.bincount(flat, minlength=int(np.prod(shape)))
+        count = count.astype(int, copy=False).reshape(shape)
 
     return actual_levels, count
@@ -1,14 +1,16 @@
 from collections import namedtuple
 from dataclasses import make_dataclass
+from functools import lru_cache
 import numpy as np
 import warnings
 from itertools import combinations
 import scipy.stats
-from scipy.optimize import shgo
+from scipy.optimize import minimize_scalar
 from . import distributions
 from ._continuous_distns import chi2, norm
-from scipy.special import gamma, kv, gammaln
+from scipy.special import logsumexp
 from . import _wilcoxon_data
+from . import _stats
 
 __all__ = ['epps_singleton_2samp', 'cramervonmises', 'somersd',
            'barnard_exact', 'boschloo_exact', 'cramervonmises_2samp']
@@ -93,9 +95,14 @@ def epps_singleton_2samp(x, y, t=(0.4, 0.8)):
     if (nx < 5) or (ny < 5):
         raise ValueError('x and y should have at least 5 elements, but len(x) '
                          '= {} and len(y) = {}.'.format(nx, ny))
-    if not np.isfinite(x).all():
+    # min and max propagate NaN and expose infinities without allocating a
+    # boolean array (unlike the sum, they cannot overflow for finite input)
+    with np.errstate(invalid='ignore'):
+        x_finite = np.isfinite(x.min()) and np.isfinite(x.max())
+        y_finite = np.isfinite(y.min()) and np.isfinite(y.max())
+    if not x_finite:
         raise ValueError('x must not contain nonfinite values.')
-    if not np.isfinite(y).all():
+    if not y_finite:
         raise ValueError('y must not contain nonfinite values.')
     n = nx + ny
 
@@ -105,28 +112,43 @@ def epps_singleton_2samp(x, y, t=(0.4, 0.8)):
     if np.less_equal(t, 0).any():
         raise ValueError('t must contain positive elements only.')
 
-    # rescale t with semi-iqr as proposed in [1]; import iqr here to avoid
-    # circular import
-    from scipy.stats import iqr
-    sigma = iqr(np.hstack((x, y))) / 2
-    ts = np.reshape(t, (-1, 1)) / sigma
+    # rescale t with semi-iqr as proposed in [1]; x and y are known to be
+    # finite, so the quartiles are taken with np.percentile directly (which
+    # partitions instead of sorting) without the NaN handling of `iqr`
+    q1, q3 = np.percentile(np.concatenate((x, y)), [25, 75])
+    sigma = (q3 - q1) / 2
+    ts = np.reshape(t, (1, -1)) / sigma
 
     # covariance estimation of ES test
-    gx = np.vstack((np.cos(ts*x), np.sin(ts*x))).T  # shape = (nx, 2*len(t))
-    gy = np.vstack((np.cos(ts*y), np.sin(ts*y))).T
-    cov_x = np.cov(gx.T, bias=True)  # the test uses biased cov-estimate
-    cov_y = np.cov(gy.T, bias=True)
+    # cos(ts*x) and sin(ts*x) are the real and imaginary parts of the
+    # empirical characteristic function terms exp(1j*ts*x). Viewing the
+    # complex array of shape (nx, len(t)) as reals gives the contiguous array
+    # of shape (nx, 2*len(t)) of interleaved cos and sin columns without a
+    # copy; the order of the columns does not change the test statistic.
+    ex = np.exp(x[:, np.newaxis] * (1j*ts))
+    ey = np.exp(y[:, np.newaxis] * (1j*ts))
+    gx = ex.view(ex.real.dtype)
+    gy = ey.view(ey.real.dtype)
+    # the test uses the biased covariance estimate
+    mx, my = gx.mean(axis=0), gy.mean(axis=0)
+    gx_c, gy_c = gx - mx, gy - my
+    cov_x = gx_c.T @ gx_c / nx
+    cov_y = gy_c.T @ gy_c / ny
     est_cov = (n/nx)*cov_x + (n/ny)*cov_y
-    est_cov_inv = np.linalg.pinv(est_cov)
-    r = np.linalg.matrix_rank(est_cov_inv)
+    # est_cov is symmetric, so a single eigendecomposition gives both its
+    # rank and the pseudo-inverse quadratic form below (same cutoff as pinv)
+    evals, evecs = np.linalg.eigh(est_cov)
+    keep = evals > 1e-15 * evals.max()
+    r = np.count_nonzero(keep)
     if r < 2*len(t):
         warnings.warn('Estimated covariance matrix does not have full rank. '
                       'This indicates a bad choice of the input t and the '
                       'test might not be consistent.')  # see p. 183 in [1]_
 
     # compute test statistic w distributed asympt. as chisquare with df=r
-    g_diff = np.mean(gx, axis=0) - np.mean(gy, axis=0)
-    w = n*np.dot(g_diff.T, np.dot(est_cov_inv, g_diff))
+    g_diff = mx - my
+    v = evecs[:, keep].T @ g_diff
+    w = n*np.sum(v**2 / evals[keep])
 
     # apply small-sample correction
     if (max(nx, ny) < 25):
@@ -159,43 +181,10 @@ def _psi1_mod(x):
     function pCvM in the package goftest (v1.1.1), permission granted
     by Adrian Baddeley. Main difference in the implementation: the code
     here keeps adding terms of the series until the terms are small enough.
+    The series is summed in compiled code, see `_stats._psi1_mod`.
     """
-
-    def _ed2(y):
-        z = y**2 / 4
-        b = kv(1/4, z) + kv(3/4, z)
-        return np.exp(-z) * (y/2)**(3/2) * b / np.sqrt(np.pi)
-
-    def _ed3(y):
-        z = y**2 / 4
-        c = np.exp(-z) / np.sqrt(np.pi)
-        return c * (y/2)**(5/2) * (2*kv(1/4, z) + 3*kv(3/4, z) - kv(5/4, z))
-
-    def _Ak(k, x):
-        m = 2*k + 1
-        sx = 2 * np.sqrt(x)
-        y1 = x**(3/4)
-        y2 = x**(5/4)
-
-        e1 = m * gamma(k + 1/2) * _ed2((4 * k + 3)/sx) / (9 * y1)
-        e2 = gamma(k + 1/2) * _ed3((4 * k + 1) / sx) / (72 * y2)
-        e3 = 2 * (m + 2) * gamma(k + 3/2) * _ed3((4 * k + 5) / sx) / (12 * y2)
-        e4 = 7 * m * gamma(k + 1/2) * _ed2((4 * k + 1) / sx) / (144 * y1)
-        e5 = 7 * m * gamma(k + 1/2) * _ed2((4 * k + 5) / sx) / (144 * y1)
-
-        return e1 + e2 + e3 + e4 + e5
-
-    x = np.asarray(x)
-    tot = np.zeros_like(x, dtype='float')
-    cond = np.ones_like(x, dtype='bool')
-    k = 0
-    while np.any(cond):
-        z = -_Ak(k, x[cond]) / (np.pi * gamma(k + 1))
-        tot[cond] = tot[cond] + z
-        cond[cond] = np.abs(z) >= 1e-7
-        k += 1
-
-    return tot
+    x = np.asarray(x, dtype=np.float64)
+    return _stats._psi1_mod(x.ravel()).reshape(x.shape)
 
 
 def _cdf_cvm_inf(x):
@@ -210,28 +199,11 @@ def _cdf_cvm_inf(x):
     here keeps adding terms of the series until the terms are small enough.
 
     The function is not expected to be accurate for large values of x, say
-    x > 4, when the cdf is very close to 1.
+    x > 4, when the cdf is very close to 1. The series is summed in compiled
+    code, see `_stats._cdf_cvm_inf`.
     """
-    x = np.asarray(x)
-
-    def term(x, k):
-        # this expression can be found in [2], second line of (1.3)
-        u = np.exp(gammaln(k + 0.5) - gammaln(k+1)) / (np.pi**1.5 * np.sqrt(x))
-        y = 4*k + 1
-        q = y**2 / (16*x)
-        b = kv(0.25, q)
-        return u * np.sqrt(y) * np.exp(-q) * b
-
-    tot = np.zeros_like(x, dtype='float')
-    cond = np.ones_like(x, dtype='bool')
-    k = 0
-    while np.any(cond):
-        z = term(x[cond], k)
-        tot[cond] = tot[cond] + z
-        cond[cond] = np.abs(z) >= 1e-7
-        k += 1
-
-    return tot
+    x = np.asarray(x, dtype=np.float64)
+    return _stats._cdf_cvm_inf(x.ravel()).reshape(x.shape)
 
 
 def _cdf_cvm(x, n=None):
@@ -360,18 +332,22 @@ def cramervonmises(rvs, cdf, args=()):
     if isinstance(cdf, str):
         cdf = getattr(distributions, cdf).cdf
 
-    vals = np.sort(np.asarray(rvs))
+    # np.array always copies, so the observations can be sorted in place
+    vals = np.array(rvs)
 
     if vals.size <= 1:
         raise ValueError('The sample must contain at least two observations.')
     if vals.ndim > 1:
         raise ValueError('The sample must be one-dimensional.')
 
+    vals.sort()
     n = len(vals)
     cdfvals = cdf(vals, *args)
 
-    u = (2*np.arange(1, n+1) - 1)/(2*n)
-    w = 1/(12*n) + np.sum((u - cdfvals)**2)
+    # u - cdfvals is formed in place and reduced with a single dot product
+    u = np.arange(1, 2*n, 2) / (2*n)
+    u -= cdfvals
+    w = 1/(12*n) + np.dot(u, u)
 
     # avoid small negative values that can occur due to the approximation
     p = max(0, 1. - _cdf_cvm(w, n))
@@ -379,12 +355,15 @@ def cramervonmises(rvs, cdf, args=()):
     return CramerVonMisesResult(statistic=w, pvalue=p)
 
 
+@lru_cache(maxsize=None)
 def _get_wilcoxon_distr(n):
     """
     Distribution of counts of the Wilcoxon ranksum statistic r_plus (sum of
     ranks of positive differences).
     Returns an array with the counts/frequencies of all the possible ranks
     r = 0, ..., n*(n+1)/2
+
+    The array is cached and shared between calls, so it is read-only.
     """
     cnt = _wilcoxon_data.COUNTS.get(n)
 
@@ -392,52 +371,35 @@ def _get_wilcoxon_distr(n):
         raise ValueError("The exact distribution of the Wilcoxon test "
                          "statistic is not implemented for n={}".format(n))
 
-    return np.array(cnt, dtype=int)
-
-
-def _Aij(A, i, j):
-    """Sum of upper-left and lower right blocks of contingency table."""
-    # See [2] bottom of page 309
-    return A[:i, :j].sum() + A[i+1:, j+1:].sum()
-
-
-def _Dij(A, i, j):
-    """Sum of lower-left and upper-right blocks of contingency table."""
-    # See [2] bottom of page 309
-    return A[i+1:, :j].sum() + A[:i, j+1:].sum()
-
+    cnt = np.array(cnt, dtype=int)
+    cnt.setflags(write=False)
+    return cnt
 
-def _P(A):
-    """Twice the number of concordant pairs, excluding ties."""
-    # See [2] bottom of page 309
-    m, n = A.shape
-    count = 0
-    for i in range(m):
-        for j in range(n):
-            count += A[i, j]*_Aij(A, i, j)
-    return count
 
+def _table_stats(A):
+    """Sums of a contingency table shared by Kendall's tau and Somers' D.
 
-def _Q(A):
-    """Twice the number of discordant pairs, excluding ties."""
-    # See [2] bottom of page 309
-    m, n = A.shape
-    count = 0
-    for i in range(m):
-        for j in range(n):
-            count += A[i, j]*_Dij(A, i, j)
-    return count
-
-
-def _a_ij_Aij_Dij2(A):
-    """A term that appears in the ASE of Kendall's tau and Somers' D."""
-    # See [2] section 4: Modified ASEs to test the null hypothesis...
-    m, n = A.shape
-    count = 0
-    for i in range(m):
-        for j in range(n):
-            count += A[i, j]*(_Aij(A, i, j) - _Dij(A, i, j))**2
-    return count
+    Returns the total count, the row and column sums, P and Q (twice the
+    number of concordant and discordant pairs, excluding ties) and the term
+    ``sum(A[i, j]*(Aij - Dij)**2)`` that appears in the ASE of Kendall's tau
+    and Somers' D. Aij is the sum of the upper-left and lower-right blocks
+    of the table relative to cell (i, j), ``A[:i, :j].sum() +
+    A[i+1:, j+1:].sum()``, and Dij the sum of the lower-left and upper-right
+    blocks, ``A[i+1:, :j].sum() + A[:i, j+1:].sum()``.
+    """
+    # See [2] bottom of page 309 and section 4: Modified ASEs to test the
+    # null hypothesis...
+    row_sums = A.sum(axis=1)
+    col_sums = A.sum(axis=0)
+    NA = row_sums.sum()
+    dtype = np.int64 if np.issubdtype(A.dtype, np.integer) else np.float64
+    # P, Q and S do not change when the table is transposed. The kernel keeps
+    # three buffers as long as a row, so make the rows the shorter axis to
+    # keep them cache-resident.
+    A_c = A.T if A.shape[1] > A.shape[0] else A
+    A_c = np.ascontiguousarray(A_c, dtype=dtype)
+    PA, QA, S = _stats._concordance_sums(A_c)
+    return NA, row_sums, col_sums, PA, QA, S
 
 
 def _tau_b(A):
@@ -448,16 +410,14 @@ def _tau_b(A):
     if A.shape[0] == 1 or A.shape[1] == 1:
         return np.nan, np.nan
 
-    NA = A.sum()
-    PA = _P(A)
-    QA = _Q(A)
-    Sri2 = (A.sum(axis=1)**2).sum()
-    Scj2 = (A.sum(axis=0)**2).sum()
+    NA, row_sums, col_sums, PA, QA, S = _table_stats(A)
+    Sri2 = np.dot(row_sums, row_sums)
+    Scj2 = np.dot(col_sums, col_sums)
     denominator = (NA**2 - Sri2)*(NA**2 - Scj2)
 
     tau = (PA-QA)/(denominator)**0.5
 
-    numerator = 4*(_a_ij_Aij_Dij2(A) - (PA - QA)**2 / NA)
+    numerator = 4*(S - (PA - QA)**2 / NA)
     s02_tau_b = numerator/denominator
     if s02_tau_b == 0:  # Avoid divide by zero
         return tau, 0
@@ -475,15 +435,13 @@ def _somers_d(A):
     if A.shape[0] <= 1 or A.shape[1] <= 1:
         return np.nan, np.nan
 
-    NA = A.sum()
+    NA, row_sums, _, PA, QA, S = _table_stats(A)
     NA2 = NA**2
-    PA = _P(A)
-    QA = _Q(A)
-    Sri2 = (A.sum(axis=1)**2).sum()
+    Sri2 = np.dot(row_sums, row_sums)
 
     d = (PA - QA)/(NA2 - Sri2)
 
-    S = _a_ij_Aij_Dij2(A) - (PA-QA)**2/NA
+    S = S - (PA-QA)**2/NA
     if S == 0:  # Avoid divide by zero
         return d, 0
     Z = (PA - QA)/(4*(S))**0.5
@@ -683,10 +641,22 @@ def _all_partitions(nx, ny):
         yield x, y
 
         
+@lru_cache(maxsize=1024)
 def _compute_log_combinations(n):
-    """Compute all log combination of C(n, k)."""
-    gammaln_arr = gammaln(np.arange(n + 1) + 1)
-    return gammaln(n + 1) - gammaln_arr - gammaln_arr[::-1]
+    """Compute all log combination of C(n, k).
+
+    The array is cached and shared between calls, so it is read-only.
+    """
+    # C(n, k) = C(n, n - k): compute the first half and mirror it. The half
+    # is built with the recurrence C(n, k) = C(n, k - 1) * (n - k + 1) / k,
+    # which avoids the cancellation between the gammaln terms for small k.
+    k = np.arange(1, n // 2 + 1)
+    half = np.empty(n // 2 + 1)
+    half[0] = 0
+    np.cumsum(np.log((n - k + 1) / k), out=half[1:])
+    log_comb = np.concatenate([half, half[:(n + 1) // 2][::-1]])
+    log_comb.setflags(write=False)
+    return log_comb
 
 
 BarnardExactResult = make_dataclass(
@@ -712,12 +682,18 @@ def barnard_exact(table, alternative="two-sided", pooled=True, n=32):
         t-test). Default is ``True``.
 
     n : int, optional
-        Number of sampling points used in the construction of the sampling
-        method. Note that this argument will automatically be converted to
-        the next higher power of 2 since `scipy.stats.qmc.Sobol` is used to
-        select sample points. Default is 32. Must be positive. In most cases,
-        32 points is enough to reach good precision. More points comes at
-        performance cost.
+        Minimum number of points of the grid used to locate the local
+        maxima of the p-value over the nuisance parameter, each of which is
+        then refined with a bounded Brent search. The grid is regular in
+        ``arcsin(sqrt(pi))`` over :math:`\pi \in [0, 1]`, so it is denser
+        close to 0 and 1 where the maxima are narrower. The maxima also
+        narrow as the sample grows, so the grid has
+        ``ceil(pi * sqrt(N))`` points instead of `n` when that is more,
+        :math:`N` being the sum of the column totals. When the p-value is
+        symmetric around 1/2, only the half of the grid over [0, 1/2] is
+        used. Default is 32. Must be positive. In most cases, 32 points is
+        enough to reach good precision. More points comes at performance
+        cost.
 
     Returns
     -------
@@ -898,13 +874,14 @@ def barnard_exact(table, alternative="two-sided", pooled=True, n=32):
     if np.any(table < 0):
         raise ValueError("All values in `table` must be nonnegative.")
 
-    if 0 in table.sum(axis=0):
+    col_sums = table.sum(axis=0)
+    total_col_1, total_col_2 = int(col_sums[0]), int(col_sums[1])
+
+    if total_col_1 == 0 or total_col_2 == 0:
         # If both values in column are zero, the p-value is 1 and
         # the score's statistic is NaN.
         return BarnardExactResult(np.nan, 1.0)
 
-    total_col_1, total_col_2 = table.sum(axis=0)
-
     x1 = np.arange(total_col_1 + 1, dtype=np.int64).reshape(-1, 1)
     x2 = np.arange(total_col_2 + 1, dtype=np.int64).reshape(1, -1)
 
@@ -913,21 +890,28 @@ def barnard_exact(table, alternative="two-sided", pooled=True, n=32):
     p1, p2 = x1 / total_col_1, x2 / total_col_2
 
     if pooled:
-        p = (x1 + x2) / (total_col_1 + total_col_2)
+        # The pooled variance only depends on x1 + x2, so the standard
+        # deviation is computed for each sum and then looked up.
+        total = total_col_1 + total_col_2
+        p = np.arange(total + 1) / total
         variances = p * (1 - p) * (1 / total_col_1 + 1 / total_col_2)
+        std = np.sqrt(variances)[x1 + x2]
     else:
         variances = p1 * (1 - p1) / total_col_1 + p2 * (1 - p2) / total_col_2
+        std = np.sqrt(variances, out=variances)
 
-    # To avoid warning when dividing by 0
-    with np.errstate(divide="ignore", invalid="ignore"):
-        wald_statistic = np.divide((p1 - p2), np.sqrt(variances))
-
-    wald_statistic[p1 == p2] = 0  # Removing NaN values
+    # The statistic is 0 where p1 == p2, including the 0 / 0 cells; cells
+    # with a null variance but p1 != p2 are infinite.
+    diff = p1 - p2
+    wald_statistic = np.zeros_like(diff)
+    with np.errstate(divide="ignore"):
+        np.divide(diff, std, out=wald_statistic, where=diff != 0)
 
     wald_stat_obs = wald_statistic[table[0, 0], table[0, 1]]
 
     if alternative == "two-sided":
-        index_arr = np.abs(wald_statistic) >= abs(wald_stat_obs)
+        index_arr = (np.abs(wald_statistic, out=wald_statistic)
+                     >= abs(wald_stat_obs))
     elif alternative == "less":
         index_arr = wald_statistic <= wald_stat_obs
     elif alternative == "greater":
@@ -939,23 +923,14 @@ def barnard_exact(table, alternative="two-sided", pooled=True, n=32):
         )
         raise ValueError(msg)
 
-    x1_sum_x2 = x1 + x2
+    if index_arr.all():
+        # Every table is at least as extreme as the observed one, so the
+        # p-value is 1 whatever the nuisance parameter
+        return BarnardExactResult(wald_stat_obs, 1.0)
 
-    x1_log_comb = _compute_log_combinations(total_col_1)
-    x2_log_comb = _compute_log_combinations(total_col_2)
-    x1_sum_x2_log_comb = x1_log_comb[x1] + x2_log_comb[x2]
-
-    result = shgo(
-        _get_binomial_log_p_value_with_nuisance_param,
-        args=(x1_sum_x2, x1_sum_x2_log_comb, index_arr),
-        bounds=((0, 1),),
-        n=n,
-        sampling_method="sobol",
+    p_value = _max_p_value_over_nuisance_param(
+        index_arr, total_col_1, total_col_2, n
     )
-
-    # result.fun is the negative log pvalue and therefore needs to be
-    # changed before return
-    p_value = np.clip(np.exp(-result.fun), a_min=0, a_max=1)
     return BarnardExactResult(wald_stat_obs, p_value)
 
 
@@ -977,12 +952,18 @@ def boschloo_exact(table, alternative="two-sided", n=32):
         Please see explanations in the Notes section below.
 
     n : int, optional
-        Number of sampling points used in the construction of the sampling
-        method. Note that this argument will automatically be converted to
-        the next higher power of 2 since `scipy.stats.qmc.Sobol` is used to
-        select sample points. Default is 32. Must be positive. In most cases,
-        32 points is enough to reach good precision. More points comes at
-        performance cost.
+        Minimum number of points of the grid used to locate the local
+        maxima of the p-value over the nuisance parameter, each of which is
+        then refined with a bounded Brent search. The grid is regular in
+        ``arcsin(sqrt(pi))`` over :math:`\pi \in [0, 1]`, so it is denser
+        close to 0 and 1 where the maxima are narrower. The maxima also
+        narrow as the sample grows, so the grid has
+        ``ceil(pi * sqrt(N))`` points instead of `n` when that is more,
+        :math:`N` being the sum of the column totals. When the p-value is
+        symmetric around 1/2, only the half of the grid over [0, 1/2] is
+        used. Default is 32. Must be positive. In most cases, 32 points is
+        enough to reach good precision. More points comes at performance
+        cost.
 
     Returns
     -------
@@ -1106,12 +1087,13 @@ def boschloo_exact(table, alternative="two-sided", n=32):
     if np.any(table < 0):
         raise ValueError("All values in `table` must be nonnegative.")
 
-    if 0 in table.sum(axis=0):
+    col_sums = table.sum(axis=0)
+    total_col_1, total_col_2 = int(col_sums[0]), int(col_sums[1])
+
+    if total_col_1 == 0 or total_col_2 == 0:
         # If both values in column are zero, the p-value is 1 and
         # the score's statistic is NaN.
         return BoschlooExactResult(np.nan, np.nan)
-
-    total_col_1, total_col_2 = table.sum(axis=0)
     total = total_col_1 + total_col_2
     x1 = np.arange(total_col_1 + 1, dtype=np.int64).reshape(1, -1)
     x2 = np.arange(total_col_2 + 1, dtype=np.int64).reshape(-1, 1)
@@ -1149,27 +1131,177 @@ def boschloo_exact(table, alternative="two-sided", n=32):
     # For more throughout explanations, see gh-14178
     index_arr = pvalues <= fisher_stat * (1+1e-13)
 
-    x1, x2, x1_sum_x2 = x1.T, x2.T, x1_sum_x2.T
-    x1_log_comb = _compute_log_combinations(total_col_1)
-    x2_log_comb = _compute_log_combinations(total_col_2)
-    x1_sum_x2_log_comb = x1_log_comb[x1] + x2_log_comb[x2]
-
-    result = shgo(
-        _get_binomial_log_p_value_with_nuisance_param,
-        args=(x1_sum_x2, x1_sum_x2_log_comb, index_arr),
-        bounds=((0, 1),),
-        n=n,
-        sampling_method="sobol",
+    if index_arr.all():
+        # Every table is at least as extreme as the observed one, so the
+        # p-value is 1 whatever the nuisance parameter
+        return BoschlooExactResult(fisher_stat, 1.0)
+
+    p_value = _max_p_value_over_nuisance_param(
+        index_arr, total_col_1, total_col_2, n
     )
+    return BoschlooExactResult(fisher_stat, p_value)
+
 
-    # result.fun is the negative log pvalue and therefore needs to be
+# Number of nuisance parameter values evaluated together on the search grid
+_NUISANCE_BATCH_SIZE = 16
+
+# Largest number of tables, (N1 + 1) * (N2 + 1), whose nuisance maximisation
+# is memoised. The packed mask of such tables takes at most 8 kB, so the cache
+# holds at most 1 MB of keys.
+_NUISANCE_CACHE_MAX_TABLES = 2**16
+
+
+def _max_p_value_over_nuisance_param(index_arr, total_col_1, total_col_2, n):
+    """
+    Maximise the p-value of Barnard's or Boschloo's test over the nuisance
+    parameter.
+
+    The result only depends on the mask of extreme tables, the column
+    totals and `n`, so it is memoised on these, the mask being packed into
+    bytes to serve as the key. See `_max_p_value_over_packed_mask`. Masks of
+    more than `_NUISANCE_CACHE_MAX_TABLES` tables are not memoised, as their
+    keys would retain too much memory.
+    """
+    args = (
+        np.packbits(index_arr).tobytes(), int(total_col_1), int(total_col_2),
+        int(n)
+    )
+    if index_arr.size > _NUISANCE_CACHE_MAX_TABLES:
+        return _max_p_value_over_packed_mask.__wrapped__(*args)
+    return _max_p_value_over_packed_mask(*args)
+
+
+@lru_cache(maxsize=128)
+def _max_p_value_over_packed_mask(index_bytes, total_col_1, total_col_2, n):
+    """
+    Maximise the p-value of Barnard's or Boschloo's test over the nuisance
+    parameter.
+
+    `index_bytes` is the packed boolean mask, indexed by ``(x1, x2)``, of
+    the tables at least as extreme as the observed one. Only those tables
+    contribute to the p-value, and they do not depend on the nuisance
+    parameter, so their terms are gathered once from the 1-D log
+    combinations.
+
+    The p-value usually has several local maxima in the nuisance parameter.
+    The negative log p-value is first evaluated on a grid over [0, 1],
+    regular in ``arcsin(sqrt(pi))``, or on its half over [0, 1/2] when the
+    p-value is symmetric around 1/2. The grid has `n` points, or about
+    ``pi * sqrt(N1 + N2)`` if that is more, so that it stays finer than the
+    maxima, which narrow as the margins grow. The grid cells around each
+    local maximum of the grid bracket a local maximum of the p-value, which
+    is then refined with a bounded Brent search. The best of them is
+    returned.
+
+    The results are cached, the cache can be emptied with
+    ``_max_p_value_over_packed_mask.cache_clear()``. Each key holds
+    ``(N1 + 1) * (N2 + 1) / 8`` bytes of packed mask, so only small masks
+    are cached by `_max_p_value_over_nuisance_param`.
+    """
+    shape = (total_col_1 + 1, total_col_2 + 1)
+    index_arr = np.unpackbits(np.frombuffer(index_bytes, dtype=np.uint8))
+    index_arr = index_arr[:shape[0] * shape[1]].reshape(shape)
+    x1, x2 = np.nonzero(index_arr)
+    x1_sum_x2 = x1 + x2
+    x1_sum_x2_log_comb = (
+        _compute_log_combinations(total_col_1)[x1]
+        + _compute_log_combinations(total_col_2)[x2]
+    )
+
+    # The counts are converted to floats once, rather than in every product
+    # of the objective
+    x1_sum_x2 = x1_sum_x2.astype(np.float64)
+    total = total_col_1 + total_col_2
+    args = (x1_sum_x2, total - x1_sum_x2, x1_sum_x2_log_comb)
+    # The terms of (x1, x2) and (N1 - x1, N2 - x2) are swapped by mapping the
+    # nuisance parameter pi to 1 - pi. If the mask is invariant under this
+    # mapping, as is typical of two-sided tests, the p-value is symmetric
+    # around 1/2 and only half of the interval has to be searched.
+    # The local maxima of the p-value are narrower close to 0 and 1, where
+    # the binomial terms are less spread out, so the grid is regular in
+    # arcsin(sqrt(pi)), which stabilises that spread.
+    # In that variable, the maxima are about 1 / (2 * sqrt(total)) wide, so
+    # the grid needs about pi * sqrt(total) points over [0, 1] not to step
+    # over one of them.
+    n = max(n, int(np.ceil(np.pi * np.sqrt(total))), 2)
+    if np.array_equal(index_arr, index_arr[::-1, ::-1]):
+        theta = np.linspace(0, np.pi / 4, n // 2 + 1)
+    else:
+        theta = np.linspace(0, np.pi / 2, n)
+    grid = np.sin(theta)**2
+    # The endpoints are moved inside (0, 1) so that the logarithms of the
+    # nuisance parameter are finite; the lost probability is negligible.
+    grid = np.clip(grid, 1e-300, 1 - 1e-16)
+    neg_log_pvalues = _get_binomial_log_p_values_on_grid(grid, *args)
+
+    # The p-value usually has several local maxima, so every local maximum
+    # of the grid is refined, not only the best one.
+    padded = np.concatenate(([np.inf], neg_log_pvalues, [np.inf]))
+    candidates = np.nonzero((neg_log_pvalues < padded[:-2])
+                            & (neg_log_pvalues <= padded[2:]))[0]
+
+    neg_log_pvalue = neg_log_pvalues[candidates].min()
+    if neg_log_pvalue <= 0:
+        # The p-value is bounded by 1, so a grid point reaching it is
+        # already the maximum and the refinement can be skipped
+        return 1.0
+
+    for k in candidates:
+        result = minimize_scalar(
+            _get_binomial_log_p_value_with_nuisance_param,
+            bounds=(grid[max(k - 1, 0)], grid[min(k + 1, grid.size - 1)]),
+            args=args,
+            method="bounded",
+            options={"xatol": 1e-12},
+        )
+        neg_log_pvalue = min(neg_log_pvalue, result.fun)
+
+    # The objective is the negative log pvalue and therefore needs to be
     # changed before return
-    p_value = np.clip(np.exp(-result.fun), a_min=0, a_max=1)
-    return BoschlooExactResult(fisher_stat, p_value)
+    return np.clip(np.exp(-neg_log_pvalue), a_min=0, a_max=1)
+
+
+def _get_binomial_log_p_values_on_grid(grid, x1_sum_x2, n_minus_x1_sum_x2,
+                                       x1_sum_x2_log_comb):
+    """
+    Evaluate `_get_binomial_log_p_value_with_nuisance_param` on a grid of
+    nuisance parameters strictly between 0 and 1.
+
+    The grid is evaluated in batches of `_NUISANCE_BATCH_SIZE` values, each
+    one as a 2-D plane of (nuisance parameter, table) terms that stays small
+    enough for the cache. The planes are built in two buffers allocated
+    once.
+    """
+    log_nuisance = np.log(grid)
+    log_1_minus_nuisance = np.log1p(-grid)
+
+    terms = np.empty((_NUISANCE_BATCH_SIZE, x1_sum_x2.size))
+    scratch = np.empty_like(terms)
+    neg_log_pvalues = np.empty(grid.size)
+    for start in range(0, grid.size, _NUISANCE_BATCH_SIZE):
+        batch = slice(start, start + _NUISANCE_BATCH_SIZE)
+        size = log_nuisance[batch].size
+        plane, work = terms[:size], scratch[:size]
+
+        # outer products of the per-nuisance logs with the per-table counts
+        np.multiply.outer(log_nuisance[batch], x1_sum_x2, out=plane)
+        np.multiply.outer(log_1_minus_nuisance[batch], n_minus_x1_sum_x2,
+                          out=work)
+        plane += work
+        plane += x1_sum_x2_log_comb
+
+        # logsumexp over the tables, done in place. The terms are finite
+        # since the grid lies inside (0, 1).
+        plane_max = plane.max(axis=1, keepdims=True)
+        plane -= plane_max
+        np.exp(plane, out=plane)
+        neg_log_pvalues[batch] = -(np.log(plane.sum(axis=1)) + plane_max[:, 0])
+
+    return neg_log_pvalues
 
 
 def _get_binomial_log_p_value_with_nuisance_param(
-    nuisance_param, x1_sum_x2, x1_sum_x2_log_comb, index_arr
+    nuisance_param, x1_sum_x2, n_minus_x1_sum_x2, x1_sum_x2_log_comb
 ):
     r"""
     Compute the log pvalue in respect of a nuisance parameter considering
@@ -1179,15 +1311,17 @@ def _get_binomial_log_p_value_with_nuisance_param(
     ----------
     nuisance_param : float
         nuisance parameter used in the computation of the maximisation of
-        the p-value. Must be between 0 and 1
+        the p-value. Must be strictly between 0 and 1
 
     x1_sum_x2 : ndarray
-        Sum of x1 and x2 inside barnard_exact
+        Sum of x1 and x2 inside barnard_exact, for the tables at least as
+        extreme as the observed one
 
-    x1_sum_x2_log_comb : ndarray
-        sum of the log combination of x1 and x2
+    n_minus_x1_sum_x2 : ndarray
+        Sum of the columns' totals minus `x1_sum_x2`
 
-    index_arr : ndarray of boolean
+    x1_sum_x2_log_comb : ndarray
+        sum of the log combination of x1 and x2, for the same tables
 
     Returns
     -------
@@ -1202,60 +1336,34 @@ def _get_binomial_log_p_value_with_nuisance_param(
     :math:`\pi \in [0, 1]` to find the maximum p-value. To search this
     maxima, this function return the negative log pvalue with respect to the
     nuisance parameter passed in params. This negative log p-value is then
-    used in `shgo` to find the minimum negative pvalue which is our maximum
-    pvalue.
+    minimised by `_max_p_value_over_packed_mask`, the minimum negative
+    pvalue being our maximum pvalue.
 
     Also, to compute the different combination used in the
-    p-values' computation formula, this function uses `gammaln` which is
-    more tolerant for large value than `scipy.special.comb`. `gammaln` gives
-    a log combination. For the little precision loss, performances are
-    improved a lot.
-    """
-    t1, t2 = x1_sum_x2.shape
-    n = t1 + t2 - 2
-    with np.errstate(divide="ignore", invalid="ignore"):
-        log_nuisance = np.log(
-            nuisance_param,
-            out=np.zeros_like(nuisance_param),
-            where=nuisance_param >= 0,
-        )
-        log_1_minus_nuisance = np.log(
-            1 - nuisance_param,
-            out=np.zeros_like(nuisance_param),
-            where=1 - nuisance_param >= 0,
-        )
-
-        nuisance_power_x1_x2 = log_nuisance * x1_sum_x2
-        nuisance_power_x1_x2[(x1_sum_x2 == 0)[:, :]] = 0
-
-        nuisance_power_n_minus_x1_x2 = log_1_minus_nuisance * (n - x1_sum_x2)
-        nuisance_power_n_minus_x1_x2[(x1_sum_x2 == n)[:, :]] = 0
+    p-values' computation formula, the caller uses log combinations, which
+    are more tolerant for large value than `scipy.special.comb`. For the
+    little precision loss, performances are improved a lot.
 
-        tmp_log_values_arr = (
-            x1_sum_x2_log_comb
-            + nuisance_power_x1_x2
-            + nuisance_power_n_minus_x1_x2
-        )
-
-    tmp_values_from_index = tmp_log_values_arr[index_arr]
+    The selection of the tables that contribute to the p-value does not
+    depend on the nuisance parameter, so it is done once by the caller and
+    this function only evaluates the terms of those tables.
+    """
+    log_nuisance = np.log(nuisance_param)
+    log_1_minus_nuisance = np.log1p(-nuisance_param)
 
-    # To avoid dividing by zero in log function and getting inf value,
-    # values are centered according to the max
-    max_value = tmp_values_from_index.max()
+    # accumulate in place to avoid a temporary per term
+    tmp_values_from_index = x1_sum_x2 * log_nuisance
+    tmp_values_from_index += n_minus_x1_sum_x2 * log_1_minus_nuisance
+    tmp_values_from_index += x1_sum_x2_log_comb
 
     # To have better result's precision, the log pvalue is taken here.
     # Indeed, pvalue is included inside [0, 1] interval. Passing the
     # pvalue to log makes the interval a lot bigger ([-inf, 0]), and thus
-    # help us to achieve better precision
-    with np.errstate(divide="ignore", invalid="ignore"):
-        log_probs = np.exp(tmp_values_from_index - max_value).sum()
-        log_pvalue = max_value + np.log(
-            log_probs,
-            out=np.full_like(log_probs, -np.inf),
-            where=log_probs > 0,
-        )
+    # help us to achieve better precision. `logsumexp` centers the terms
+    # on their max before exponentiating them.
+    log_pvalue = logsumexp(tmp_values_from_index)
 
-    # Since shgo find the minima, minus log pvalue is returned
+    # Since the optimizer finds the minima, minus log pvalue is returned
     return -log_pvalue
 
 
@@ -753,3 +753,156 @@ def gaussian_kernel_estimate(points, values, xi, precision, dtype, real _=0):
                 estimate[j, k] += values_[i, k] * arg
 
     return np.asarray(estimate)
+
+
+# Series for the cdf of the Cramér-von Mises statistic, see `_hypotests.py`.
+# Csorgo, S. and Faraway, J. (1996). The Exact and Asymptotic Distribution of
+# Cramér-von Mises Statistics. Journal of the Royal Statistical Society,
+# pp. 221-234.
+
+@cython.cdivision(True)
+cdef double _cdf_cvm_inf_kernel(double x) nogil:
+    cdef double tot = 0, y, q, z
+    cdef int k = 0
+    # u = Gamma(k + 1/2) / Gamma(k + 1) / (pi**1.5 * sqrt(x)) is updated
+    # with the recurrence of the gamma function instead of calling gammaln
+    cdef double u = 1 / (PI * math.sqrt(x))
+
+    while True:
+        # this expression can be found in [2], second line of (1.3)
+        y = 4*k + 1
+        q = y*y / (16*x)
+        z = u * math.sqrt(y) * math.exp(-q) * cs.kv(0.25, q)
+        tot += z
+        # a NaN term also ends the summation
+        if not math.fabs(z) >= 1e-7:
+            return tot
+        u *= (k + 0.5) / (k + 1)
+        k += 1
+
+
+@cython.cdivision(True)
+cdef void _cvm_ed23(double y, double *ed2, double *ed3) nogil:
+    # _ed2(y) and, unless ed3 is NULL, _ed3(y) of the MAPLE code; both share
+    # the values of the Bessel functions
+    cdef double z = y*y / 4
+    cdef double c = math.exp(-z) / math.sqrt(PI)
+    cdef double kv1 = cs.kv(0.25, z), kv3 = cs.kv(0.75, z)
+
+    ed2[0] = c * math.pow(y/2, 1.5) * (kv1 + kv3)
+    if ed3 != NULL:
+        ed3[0] = c * math.pow(y/2, 2.5) * (2*kv1 + 3*kv3 - cs.kv(1.25, z))
+
+
+@cython.cdivision(True)
+cdef double _psi1_mod_kernel(double x) nogil:
+    cdef double tot = 0, z, m, ak
+    cdef double sx = 2 * math.sqrt(x)
+    cdef double y1 = math.pow(x, 0.75)
+    cdef double y2 = math.pow(x, 1.25)
+    # r = Gamma(k + 1/2) / Gamma(k + 1) is updated with the recurrence of the
+    # gamma function, which also avoids the overflow of Gamma(k + 1)
+    cdef double r = math.sqrt(PI)
+    # _ed2 and _ed3 at (4k + 1) / sx, (4k + 3) / sx and (4k + 5) / sx; the
+    # values at (4k + 5) / sx are those at (4(k + 1) + 1) / sx of the next term
+    cdef double ed2_1, ed3_1, ed2_3, ed2_5, ed3_5
+    cdef int k = 0
+
+    _cvm_ed23(1 / sx, &ed2_1, &ed3_1)
+    while True:
+        _cvm_ed23((4*k + 3) / sx, &ed2_3, NULL)
+        _cvm_ed23((4*k + 5) / sx, &ed2_5, &ed3_5)
+        m = 2*k + 1
+        # A_k(x) / Gamma(k + 1/2); Gamma(k + 3/2) = (k + 1/2) Gamma(k + 1/2)
+        ak = (m * ed2_3 / (9 * y1)
+              + ed3_1 / (72 * y2)
+              + 2 * (m + 2) * (k + 0.5) * ed3_5 / (12 * y2)
+              + 7 * m * (ed2_1 + ed2_5) / (144 * y1))
+        z = -ak * r / PI
+        tot += z
+        # a NaN term also ends the summation
+        if not math.fabs(z) >= 1e-7:
+            return tot
+        r *= (k + 0.5) / (k + 1)
+        ed2_1 = ed2_5
+        ed3_1 = ed3_5
+        k += 1
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def _cdf_cvm_inf(const double[::1] x):
+    """Evaluate `_hypotests._cdf_cvm_inf` elementwise on a 1-D array."""
+    cdef Py_ssize_t i
+    cdef double[::1] out = np.empty(x.shape[0])
+    with nogil:
+        for i in range(x.shape[0]):
+            out[i] = _cdf_cvm_inf_kernel(x[i])
+    return np.asarray(out)
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def _psi1_mod(const double[::1] x):
+    """Evaluate `_hypotests._psi1_mod` elementwise on a 1-D array."""
+    cdef Py_ssize_t i
+    cdef double[::1] out = np.empty(x.shape[0])
+    with nogil:
+        for i in range(x.shape[0]):
+            out[i] = _psi1_mod_kernel(x[i])
+    return np.asarray(out)
+
+
+ctypedef fused table_t:
+    int64_t
+    float64_t
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def _concordance_sums(const table_t[:, ::1] A):
+    """
+    Compute P, Q and sum(A * (Aij - Dij)**2) of a contingency table A.
+
+    See `_hypotests._table_stats`. Aij and Dij are obtained from running
+    cumulative sums of the rows, so that the table is traversed once
+    without storing Aij and Dij.
+    """
+    cdef Py_ssize_t m = A.shape[0], n = A.shape[1], i, j, p, c
+    cdef table_t total, s, a, Aij, Dij
+    cdef table_t P = 0, Q = 0, S = 0
+    # col_cum[j] = A[:, :j].sum(); while processing row i,
+    # cum[p, j] = A[:i, :j].sum() and cum[c, j] = A[:i+1, :j].sum()
+    cdef table_t[::1] col_cum
+    cdef table_t[:, ::1] cum
+
+    dtype = np.int64 if table_t is int64_t else np.float64
+    col_cum = np.zeros(n + 1, dtype=dtype)
+    cum = np.zeros((2, n + 1), dtype=dtype)
+
+    with nogil:
+        for i in range(m):
+            for j in range(n):
+                col_cum[j + 1] += A[i, j]
+        for j in range(n):
+            col_cum[j + 1] += col_cum[j]
+        total = col_cum[n]
+
+        for i in range(m):
+            p = i % 2
+            c = 1 - p
+            s = 0
+            for j in range(n):
+                s = s + A[i, j]
+                cum[c, j + 1] = cum[p, j + 1] + s
+            for j in range(n):
+                a = A[i, j]
+                # upper-left + lower-right, and lower-left + upper-right
+                Aij = (cum[p, j]
+                       + (total - cum[c, n] - col_cum[j + 1] + cum[c, j + 1]))
+                Dij = (col_cum[j] - cum[c, j]) + (cum[p, n] - cum[p, j + 1])
+                P = P + a*Aij
+                Q = Q + a*Dij
+                S = S + a*(Aij - Dij)*(Aij - Dij)
+
+    return P, Q, S
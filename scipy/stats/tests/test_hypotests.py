@@ -13,7 +13,8 @@ from scipy.stats import distributions
 from scipy.stats._hypotests import (epps_singleton_2samp, cramervonmises,
                                     _cdf_cvm, cramervonmises_2samp,
                                     _pval_cvm_2samp_exact, barnard_exact,
-                                    boschloo_exact)
+                                    boschloo_exact, _table_stats,
+                                    _max_p_value_over_packed_mask)
 from scipy.stats._mannwhitneyu import mannwhitneyu, _mwu_state
 from .common_tests import check_named_results
 
@@ -858,6 +859,32 @@ class TestSomersD:
         res = stats.somersd(x, y)
         assert_equal(res.table, np.eye(10))
 
+    @pytest.mark.parametrize("dtype", [np.int64, np.float64])
+    def test_table_stats(self, dtype):
+        # compare P, Q and the ASE term against direct summation over the
+        # blocks of the table
+        rng = np.random.default_rng(7526)
+        A = rng.integers(0, 10, size=(4, 6)).astype(dtype)
+        P = Q = S = 0
+        m, n = A.shape
+        for i in range(m):
+            for j in range(n):
+                Aij = A[:i, :j].sum() + A[i+1:, j+1:].sum()
+                Dij = A[i+1:, :j].sum() + A[:i, j+1:].sum()
+                P += A[i, j]*Aij
+                Q += A[i, j]*Dij
+                S += A[i, j]*(Aij - Dij)**2
+        res = _table_stats(A)
+        assert_equal(res[3:], (P, Q, S))
+        assert_equal(res[0], A.sum())
+        # the sums are computed on the transposed table if it is wider than
+        # tall; check that both orientations agree
+        assert_equal(_table_stats(A.T)[3:], (P, Q, S))
+        # a read-only table that needs no copy is passed to the kernel as is
+        B = np.ascontiguousarray(A.T)
+        B.flags.writeable = False
+        assert_equal(_table_stats(B)[3:], (P, Q, S))
+
 
 class TestBarnardExact:
     """Some tests to show that barnard_exact() works correctly."""
@@ -891,6 +918,23 @@ class TestBarnardExact:
         statistic, pvalue = res.statistic, res.pvalue
         assert_allclose([statistic, pvalue], expected)
 
+    @pytest.mark.parametrize(
+        "input_sample,alternative,expected",
+        [
+            ([[10, 280], [1, 191]], "greater", 0.085966355712),
+            ([[8, 292], [9, 114]], "less", 0.056539111190),
+        ],
+    )
+    def test_multimodal_nuisance(self, input_sample, alternative, expected):
+        """The p-value has several local maxima in the nuisance parameter
+        for these tables, the largest one being close to 0 or 1. The
+        expected values are the largest local maximum over a regular grid
+        of 20001 nuisance values, each one refined by a golden-section
+        search.
+        """
+        res = barnard_exact(input_sample, alternative=alternative)
+        assert_allclose(res.pvalue, expected)
+
     @pytest.mark.parametrize(
         "input_sample,expected",
         [
@@ -1138,6 +1182,53 @@ class TestBoschlooExact:
         assert_equal(pvalue, expected[0])
         assert_equal(statistic, expected[1])
 
+    @pytest.mark.parametrize(
+        "input_sample,alternative,expected",
+        [
+            ([[11, 212], [6, 140]], "greater",
+             (0.460943957632, 0.368396061022)),
+            ([[11, 212], [6, 140]], "two-sided",
+             (0.460943957632, 0.736792122044)),
+        ],
+    )
+    def test_multimodal_nuisance(self, input_sample, alternative, expected):
+        """The largest local maximum of the p-value in the nuisance
+        parameter is too narrow for a grid of 32 points at these margins.
+        The expected values are the largest local maximum over a grid of
+        1200 nuisance values, each one refined by a golden-section search.
+        """
+        res = boschloo_exact(input_sample, alternative=alternative)
+        statistic, pvalue = res.statistic, res.pvalue
+        assert_allclose([statistic, pvalue], expected)
+
+    def test_nuisance_cache(self):
+        # The maximisation over the nuisance parameter is memoised on the
+        # packed mask of extreme tables, and shared by Barnard's and
+        # Boschloo's tests. These tables share their margins, and
+        # (14 + 1) * (13 + 1) is not a multiple of 8, so the packed masks
+        # are padded.
+        tables = [[[5, 9], [9, 4]], [[7, 12], [7, 1]]]
+        calls = list(product([barnard_exact, boschloo_exact], tables))
+
+        expected = []
+        for func, table in calls:
+            _max_p_value_over_packed_mask.cache_clear()
+            expected.append(func(table))
+
+        _max_p_value_over_packed_mask.cache_clear()
+        for _ in range(2):
+            for (func, table), res in zip(calls, expected):
+                new = func(table)
+                assert_equal([new.statistic, new.pvalue],
+                             [res.statistic, res.pvalue])
+        assert _max_p_value_over_packed_mask.cache_info().hits > 0
+
+        # (256 + 1) * (256 + 1) tables are too many for their mask to be
+        # kept as a key
+        _max_p_value_over_packed_mask.cache_clear()
+        barnard_exact([[120, 136], [136, 120]])
+        assert _max_p_value_over_packed_mask.cache_info().currsize == 0
+
 class TestCvm_2samp:
     def test_invalid_input(self):
         x = np.arange(10).reshape((2, 5))